@@ -1,8 +1,59 @@
 import pandas as pd
-import requests, json, sys
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+import requests, sys, os, re, time, base64, asyncio, threading, tempfile, hashlib
+import httpx
+import orjson
+import requests_cache
 from io import BytesIO
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from azure.identity import DefaultAzureCredential
-from msal import ConfidentialClientApplication
+from msal import ConfidentialClientApplication, SerializableTokenCache
+
+GRAPH_BATCH_URL = "https://graph.microsoft.com/v1.0/$batch"
+GRAPH_BATCH_LIMIT = 20  # Maximum number of requests allowed in one JSON batch
+# Concurrent file downloads, kept low to respect Graph throttling
+DOWNLOAD_CONCURRENCY = 12
+# Cache for MSAL's instance discovery and OpenID metadata, kept in the user's cache directory
+MSAL_HTTP_CACHE = "msal_http_cache"
+# Transient Graph failures are retried with exponential backoff, honouring Retry-After
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 8
+RETRY_BACKOFF_FACTOR = 0.75
+# Timeouts of the download and upload clients, reads are generous for large files and ranges
+TRANSFER_TIMEOUT = httpx.Timeout(300.0, connect=30.0)
+# Size of the blocks the multithreaded Arrow CSV parser works on
+CSV_BLOCK_SIZE = 8 << 20
+# Workbooks larger than this are streamed to disk before parsing
+LARGE_WORKBOOK_SIZE = 50 << 20
+# Files larger than this are uploaded through an upload session in ranges
+SIMPLE_UPLOAD_LIMIT = 4 << 20
+# Size of each uploaded range, Graph requires a multiple of 320 KiB
+UPLOAD_CHUNK_SIZE = 10 << 20
+# Seconds a cached folder ID stays valid, folders can be renamed or moved
+FOLDER_CACHE_TTL = 3600
+# Seconds before expiry at which the access token is renewed
+TOKEN_REFRESH_MARGIN = 300
+
+# Credentials are shared process-wide so their token caches and HTTP sessions are reused
+_MSAL_APPS: Dict[Tuple, ConfidentialClientApplication] = {}
+_DAC_SINGLETON: Optional[DefaultAzureCredential] = None
+_CREDENTIAL_LOCK = threading.Lock()
 
 
 class MICROSOFT_GRAPH:
@@ -13,7 +64,11 @@ class MICROSOFT_GRAPH:
     """
 
     def __init__(
-        self, client_id: str, client_credential: str, auth_type: str = "secret"
+        self,
+        client_id: str,
+        client_credential: str,
+        auth_type: str = "secret",
+        token_cache_path: Optional[str] = None,
     ) -> None:
         """
         Initializes a new instance of the class.
@@ -22,88 +77,512 @@ class MICROSOFT_GRAPH:
             client_id (str): The client ID for the application registered in Azure Portal.
             client_credential (str): The client secret for the application.
             auth_type (str): The type of authentication to use ('managed' for Managed Identity, 'secret' for Client Secret).
+            token_cache_path (str, optional): File used to persist MSAL's token cache between runs. Defaults to an in-memory cache.
+                MSAL's discovery metadata is always cached in msal_http_cache.sqlite in the user's cache directory (e.g. ~/.cache).
         """
         self.client_id = client_id
         self.client_credential = client_credential
         self.auth_type = auth_type
+        self.token_cache_path = token_cache_path
         self.authority = "https://login.microsoftonline.com/<tenant_id>"  # Insert your Org's Tenant ID
         self.scopes = ["https://graph.microsoft.com/.default"]
+        self._token_expires_on = 0.0
         self.access_token = self.__get_access_token()
+        self.session = self.__create_session()
+        self._drive_id_cache: Dict[str, str] = {}
+        self._folder_id_cache: Dict[Tuple[str, str], Tuple[str, float]] = {}
 
     def __get_access_token(self) -> str:
         """
         Method to obtain an access token from Microsoft Identity Platform.
         Depending on the authentication type, this method will either use a managed identity
-        or a client secret to authenticate.
+        or a client secret to authenticate. Cached tokens are returned when still valid,
+        and the expiry of the returned token is recorded for __authorize.
 
         Returns:
             str: An access token that can be used to authenticate API requests.
+
+        Raises:
+            RuntimeError: If MSAL cannot acquire a token, e.g. because the secret was rejected.
+            ValueError: If the authentication type is not supported.
         """
+        global _DAC_SINGLETON
         if self.auth_type == "managed":
-            credential = DefaultAzureCredential()
-            token_response = credential.get_token(self.scopes)
+            with _CREDENTIAL_LOCK:
+                if _DAC_SINGLETON is None:
+                    _DAC_SINGLETON = DefaultAzureCredential()
+            token_response = _DAC_SINGLETON.get_token(*self.scopes)
+            self._token_expires_on = token_response.expires_on
             return token_response.token
         elif self.auth_type == "secret":
-            client = ConfidentialClientApplication(
-                client_id=self.client_id,
-                authority=self.authority,
-                client_credential=self.client_credential,
+            # Apps are only shared between instances with the same secret and cache file
+            secret_hash = hashlib.sha256(self.client_credential.encode()).hexdigest()
+            key = (
+                self.client_id,
+                self.authority,
+                secret_hash,
+                self.token_cache_path,
             )
-            token_response = client.acquire_token_for_client(scopes=self.scopes)
+            with _CREDENTIAL_LOCK:
+                client = _MSAL_APPS.get(key)
+                if client is None:
+                    token_cache = SerializableTokenCache()
+                    if self.token_cache_path and os.path.exists(self.token_cache_path):
+                        with open(self.token_cache_path, "r") as cache_file:
+                            token_cache.deserialize(cache_file.read())
+
+                    client = ConfidentialClientApplication(
+                        client_id=self.client_id,
+                        authority=self.authority,
+                        client_credential=self.client_credential,
+                        token_cache=token_cache,
+                        # Discovery metadata rarely changes, so keep it for a day
+                        http_client=requests_cache.CachedSession(
+                            MSAL_HTTP_CACHE, use_cache_dir=True, expire_after=86400
+                        ),
+                    )
+                    _MSAL_APPS[key] = client
+
+            token_response = client.acquire_token_silent(self.scopes, account=None)
+            if not token_response:
+                token_response = client.acquire_token_for_client(scopes=self.scopes)
+            if "access_token" not in token_response:
+                # MSAL reports failures such as a rejected secret in the response instead of raising
+                raise RuntimeError(
+                    f"Could not acquire an access token: {token_response.get('error')}: "
+                    f"{token_response.get('error_description')}"
+                )
+
+            token_cache = client.token_cache
+            if self.token_cache_path and token_cache.has_state_changed:
+                # The cache holds access tokens, so keep the file private to the user
+                cache_fd = os.open(
+                    self.token_cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+                )
+                with os.fdopen(cache_fd, "w") as cache_file:
+                    cache_file.write(token_cache.serialize())
+            self._token_expires_on = time.time() + token_response["expires_in"]
             return token_response["access_token"]
         else:
             raise ValueError("Invalid authentication type")
 
+    def __authorize(
+        self, request: requests.PreparedRequest
+    ) -> requests.PreparedRequest:
+        """
+        Adds the bearer token to an outgoing request, renewing it shortly before it expires
+        so long-lived instances keep working.
+
+        Args:
+            request (requests.PreparedRequest): The request about to be sent.
+
+        Returns:
+            requests.PreparedRequest: The request carrying a valid bearer token.
+        """
+        if time.time() >= self._token_expires_on - TOKEN_REFRESH_MARGIN:
+            self.access_token = self.__get_access_token()
+        request.headers["Authorization"] = f"Bearer {self.access_token}"
+        return request
+
+    def __create_session(self) -> requests.Session:
+        """
+        Creates an authenticated HTTP session shared by all Graph API calls of this instance.
+        Connections are kept alive and pooled, and throttled or unavailable responses are retried.
+
+        Returns:
+            requests.Session: A session authorizing every request with a current bearer token.
+        """
+        session = requests.Session()
+        session.auth = self.__authorize
+        session.headers.update({"Accept-Encoding": "gzip"})
+        retries = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=["GET", "PUT", "POST"],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+        session.mount("https://", adapter)
+        return session
+
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+        """
+        Computes how long to wait before retrying a throttled or failed request.
+
+        Args:
+            attempt (int): The number of retries already made.
+            retry_after (str, optional): The Retry-After header of the response, if any.
+
+        Returns:
+            float: The number of seconds to wait.
+        """
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        return RETRY_BACKOFF_FACTOR * 2**attempt
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        """
+        Raises the same HTTPError as requests for a failed download or upload response,
+        so callers only need to handle the exceptions of requests.
+
+        Args:
+            response (httpx.Response): The response to check.
+
+        Raises:
+            HTTPError: If the response has a 4xx or 5xx status.
+        """
+        if response.is_error:
+            # Pre-authenticated URLs carry their token in the query, so leave it out
+            url = response.url.copy_with(query=None)
+            raise requests.exceptions.HTTPError(
+                f"{response.status_code} Error: {response.reason_phrase} for url: {url}"
+            )
+
+    @staticmethod
+    def _run_coroutine(coroutine: Coroutine) -> Any:
+        """
+        Runs a coroutine to completion from synchronous code. When an event loop is already
+        running in this thread (e.g. in Jupyter), the coroutine runs on its own loop in a helper thread.
+
+        Args:
+            coroutine (coroutine): The coroutine to run.
+
+        Returns:
+            The value returned by the coroutine.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        with ThreadPoolExecutor(max_workers=1) as loop_thread:
+            return loop_thread.submit(asyncio.run, coroutine).result()
+
+    def clear_cache(self) -> None:
+        """
+        Forgets the drive and folder IDs cached by this instance, e.g. after folders were renamed.
+        """
+        self._drive_id_cache.clear()
+        self._folder_id_cache.clear()
+
     def _get_folder_id(self, teams_group_id: str, folder_path: str) -> str:
         """
         Retrieves the unique identifier of a folder within a SharePoint site.
+        Results are cached for an hour per instance.
 
         Args:
             teams_group_id (str): The unique identifier for the Teams group.
             folder_path (str): The name of the folder to search for.
 
         Returns:
-            str: The unique identifier of the folder if found, otherwise an empty string.
+            str: The unique identifier of the folder.
+
+        Raises:
+            HTTPError: If the folder cannot be retrieved.
         """
-        folder_url = f"https://graph.microsoft.com/v1.0/groups/{teams_group_id}/drive/root:/{folder_path}"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
+        key = (teams_group_id, folder_path)
+        cached = self._folder_id_cache.get(key)
+        if cached is not None and time.monotonic() - cached[1] < FOLDER_CACHE_TTL:
+            return cached[0]
 
-        try:
-            response = requests.get(folder_url, headers=headers)
-            response.raise_for_status()
-            data = json.loads(response.text)
-            folder_id = data["id"]
-            return folder_id
-        except requests.exceptions.HTTPError as http_err:
-            return f"HTTP error occurred: {http_err}"
-        except Exception as err:
-            return f"Other error occurred: {err}"
+        folder_url = f"https://graph.microsoft.com/v1.0/groups/{teams_group_id}/drive/root:/{folder_path}?$select=id"
+
+        response = self.session.get(folder_url)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        folder_id = data["id"]
+        self._folder_id_cache[key] = (folder_id, time.monotonic())
+        return folder_id
 
     def _get_drive_id(self, site_id: str) -> str:
         """
         Retrieves the drive ID of the 'Documents' folder for a given SharePoint site.
+        Drive IDs never change, so each site is only looked up once per instance.
 
         Args:
             site_id (str): The unique identifier for the SharePoint site.
 
         Returns:
             str: The drive ID of the 'Documents' folder.
+
+        Raises:
+            HTTPError: If the drives cannot be retrieved.
+            ValueError: If the site has no 'Documents' drive.
         """
+        if site_id in self._drive_id_cache:
+            return self._drive_id_cache[site_id]
+
         drives_url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
 
+        response = self.session.get(drives_url)
+        response.raise_for_status()
+        drives = orjson.loads(response.content).get("value", [])
+        for drive in drives:
+            if drive["name"] == "Documents":
+                self._drive_id_cache[site_id] = drive["id"]
+                return drive["id"]
+        raise ValueError("The site has no 'Documents' drive.")
+
+    @staticmethod
+    def _write_temp_file(content: bytes) -> str:
+        """
+        Writes content to a new temporary CSV file that is kept after closing.
+
+        Args:
+            content (bytes): The content to write.
+
+        Returns:
+            str: The path of the temporary file.
+        """
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as temp_file:
+            temp_file.write(content)
+        return temp_file.name
+
+    @staticmethod
+    def _parse_temp_file(parse: Callable[[str], Any], path: str) -> Any:
+        """
+        Parses a temporary file and deletes it afterwards.
+
+        Args:
+            parse (callable): Function turning the path of the file into a result.
+            path (str): The path of the temporary file.
+
+        Returns:
+            The value returned by `parse`.
+        """
         try:
-            response = requests.get(drives_url, headers=headers)
-            response.raise_for_status()
-            drives = response.json().get("value", [])
-            for drive in drives:
-                if drive["name"] == "Documents":
-                    return drive["id"]
-        except requests.exceptions.HTTPError as http_err:
-            return f"HTTP error occurred: {http_err}"
-        except Exception as err:
-            return f"Other error occurred: {err}"
-        return ""
+            return parse(path)
+        finally:
+            os.remove(path)
+
+    @staticmethod
+    def _completed_future(path: str) -> Future:
+        """
+        Wraps the path of a downloaded file in a finished future, for downloads that are not parsed.
+
+        Args:
+            path (str): The path of the downloaded file.
+
+        Returns:
+            Future: A future already holding the path.
+        """
+        future: Future = Future()
+        future.set_result(path)
+        return future
+
+    def _batch_download_files(
+        self,
+        site_id: str,
+        drive_id: str,
+        items: List[dict],
+        parse: Optional[Callable[[str], Any]] = None,
+    ) -> List[Any]:
+        """
+        Downloads several drive items using Microsoft Graph JSON batching and parses each of them.
+        Requests are grouped into batches of up to 20, so N files need ceil(N/20) round-trips.
+        Every file is handed to a pool of parser threads as soon as it is on disk, so parsing
+        overlaps with the downloads still in flight.
+
+        Args:
+            site_id (str): The unique identifier for the SharePoint site.
+            drive_id (str): The unique identifier of the drive holding the items.
+            items (list): The drive items (as returned by Graph) to download.
+            parse (callable, optional): Function turning the path of a downloaded file into a result.
+                When omitted, the paths of the downloaded files are returned and the caller must delete them.
+
+        Returns:
+            list: The parsed result (or path) for each item, in the same order as `items`.
+
+        Raises:
+            HTTPError: If the batch request or any of its inner requests fails.
+        """
+        requests_list = [
+            {
+                "id": str(i),
+                "method": "GET",
+                "url": f"/sites/{site_id}/drives/{drive_id}/items/{item['id']}/content",
+            }
+            for i, item in enumerate(items)
+        ]
+        results: Dict[str, Future] = {}
+        download_urls: Dict[str, str] = {}
+
+        try:
+            with ExitStack() as stack:
+                if parse is None:
+                    # The caller takes ownership of the files, so no parser threads are needed
+                    submit = self._completed_future
+                else:
+                    parse_pool = stack.enter_context(
+                        ThreadPoolExecutor(max_workers=os.cpu_count())
+                    )
+                    submit = partial(
+                        parse_pool.submit, partial(self._parse_temp_file, parse)
+                    )
+                for start in range(0, len(requests_list), GRAPH_BATCH_LIMIT):
+                    pending = requests_list[start : start + GRAPH_BATCH_LIMIT]
+                    attempt = 0
+                    while pending:
+                        response = self.session.post(
+                            GRAPH_BATCH_URL, json={"requests": pending}
+                        )
+                        response.raise_for_status()
+
+                        throttled = []
+                        delay = 0.0
+                        for inner in orjson.loads(response.content)["responses"]:
+                            status = inner["status"]
+                            inner_headers = inner.get("headers", {})
+                            if status in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+                                # Throttled or failed requests are retried after a delay
+                                throttled.append(inner["id"])
+                                delay = max(
+                                    delay,
+                                    self._retry_delay(
+                                        attempt, inner_headers.get("Retry-After")
+                                    ),
+                                )
+                            elif status == 302:
+                                # Batched content requests answer with a pre-authenticated download URL
+                                download_urls[inner["id"]] = inner_headers["Location"]
+                            elif status == 200:
+                                # Binary bodies are returned base64-encoded inside the batch response
+                                body = inner.get("body", "")
+                                content_type = inner_headers.get("Content-Type", "")
+                                if content_type.startswith("application/json"):
+                                    content = orjson.dumps(body)
+                                elif content_type.startswith("text/"):
+                                    content = body.encode()
+                                else:
+                                    content = base64.b64decode(body)
+                                results[inner["id"]] = submit(
+                                    self._write_temp_file(content)
+                                )
+                            else:
+                                raise requests.exceptions.HTTPError(
+                                    f"Batch request {inner['id']} failed with status {status}: {inner.get('body')}"
+                                )
+
+                        pending = [
+                            request for request in pending if request["id"] in throttled
+                        ]
+                        if pending:
+                            time.sleep(delay)
+                            attempt += 1
+
+                # Fetch the redirected downloads concurrently
+                if download_urls:
+                    self._run_coroutine(
+                        self._download_files(download_urls, submit, results)
+                    )
+        except BaseException:
+            if parse is None:
+                # Files already downloaded would never reach the caller, so remove them
+                for future in results.values():
+                    if future.exception() is None:
+                        os.remove(future.result())
+            raise
+
+        return [results[request["id"]].result() for request in requests_list]
+
+    async def _download_csv(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        name: str,
+        url: str,
+        submit: Callable[[str], Future],
+    ) -> Tuple[str, Future]:
+        """
+        Streams a single file into a temporary file, waiting for a free slot in the semaphore first,
+        then hands it to the parser threads.
+
+        Args:
+            client (httpx.AsyncClient): The shared client used for all downloads.
+            semaphore (asyncio.Semaphore): Bounds the number of downloads in flight.
+            name (str): The key under which the result is returned.
+            url (str): The download URL of the file.
+            submit (callable): Queues the path of the downloaded file for parsing.
+
+        Returns:
+            tuple: The given name and the future of the parsed result.
+        """
+        async with semaphore:
+            for attempt in range(MAX_RETRIES + 1):
+                last_attempt = attempt == MAX_RETRIES
+                try:
+                    async with client.stream("GET", url) as response:
+                        if (
+                            response.status_code not in RETRY_STATUS_CODES
+                            or last_attempt
+                        ):
+                            self._raise_for_status(response)
+                            with tempfile.NamedTemporaryFile(
+                                delete=False, suffix=".csv"
+                            ) as temp_file:
+                                try:
+                                    async for chunk in response.aiter_bytes():
+                                        temp_file.write(chunk)
+                                except BaseException:
+                                    temp_file.close()
+                                    os.remove(temp_file.name)
+                                    raise
+                            break
+                        # Throttled or failed downloads are retried after a delay
+                        retry_after = response.headers.get("Retry-After")
+                except httpx.TransportError as error:
+                    # Dropped connections and timeouts are retried the same way
+                    if last_attempt:
+                        raise requests.exceptions.ConnectionError(str(error)) from error
+                    retry_after = None
+                await asyncio.sleep(self._retry_delay(attempt, retry_after))
+        # The download slot is released before parsing so the next file can start
+        return name, submit(temp_file.name)
+
+    async def _download_files(
+        self,
+        urls: Dict[str, str],
+        submit: Callable[[str], Future],
+        results: Dict[str, Future],
+    ) -> None:
+        """
+        Downloads several files concurrently over one pooled HTTP/2 client and queues them for parsing.
+
+        Args:
+            urls (dict): A mapping of names to download URLs.
+            submit (callable): Queues the path of each downloaded file for parsing.
+            results (dict): Receives the future of each queued file under its name, even if another download fails.
+
+        Raises:
+            HTTPError: If any of the downloads fails.
+            ConnectionError: If a download keeps losing its connection or timing out.
+        """
+        semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+        async with httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=32),
+            timeout=TRANSFER_TIMEOUT,
+        ) as client:
+            downloads = await asyncio.gather(
+                *[
+                    self._download_csv(client, semaphore, name, url, submit)
+                    for name, url in urls.items()
+                ],
+                return_exceptions=True,
+            )
+
+        errors = []
+        for download in downloads:
+            if isinstance(download, BaseException):
+                errors.append(download)
+            else:
+                name, future = download
+                results[name] = future
+        if errors:
+            raise errors[0]
 
     def read_sharepoint_excel(
         self,
@@ -112,40 +591,162 @@ class MICROSOFT_GRAPH:
         dtype=None,
         sheet_name=0,
         usecols=None,
-    ) -> Union[pd.DataFrame, str]:
+    ) -> Union[pd.DataFrame, Dict[Any, pd.DataFrame]]:
         """
         Reads an Excel file from SharePoint Online from a specified directory
-        and returns as pandas DataFrame.
+        and returns as pandas DataFrame. The workbook is parsed with the Rust-based Calamine engine
+        into Arrow-backed columns.
 
         Args:
             teams_group_id (str): The unique identifier for the teams group
             file_path (str): The path to the Excel file in SharePoint Online.
+            dtype (type or dict, optional): Data type for data or columns. Default to None.
             sheet_name (int, str, list, or None, optional): Name or index of the sheet, None to read all sheets. Default to 0.
+            usecols (str, list, or callable, optional): Subset of columns to parse. Default to None (all columns).
         Returns:
-            A Pandas DataFrame
+            A Pandas DataFrame (backed by Arrow dtypes), or a dict of DataFrames keyed by sheet
+            when `sheet_name` is a list or None.
+
+        Raises:
+            HTTPError: If the file cannot be downloaded.
         """
         file_url = f"https://graph.microsoft.com/v1.0/groups/{teams_group_id}/drive/root:/{file_path}:/content"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-        response = requests.get(file_url, headers=headers)
+        temp_path = None
         try:
+            # The connection goes back to the pool once the workbook is downloaded
+            with self.session.get(file_url, stream=True) as response:
+                response.raise_for_status()
+                if int(response.headers.get("Content-Length", 0)) > LARGE_WORKBOOK_SIZE:
+                    # Large workbooks are streamed to disk instead of being held in memory
+                    suffix = os.path.splitext(file_path)[1]
+                    with tempfile.NamedTemporaryFile(
+                        delete=False, suffix=suffix
+                    ) as temp_file:
+                        temp_path = temp_file.name
+                        for chunk in response.iter_content(CSV_BLOCK_SIZE):
+                            temp_file.write(chunk)
+                    excel_content = temp_path
+                else:
+                    excel_content = BytesIO(response.content)
+
+            df = pd.read_excel(
+                excel_content,
+                dtype=dtype,
+                sheet_name=sheet_name,
+                usecols=usecols,
+                engine="calamine",
+                dtype_backend="pyarrow",
+            )
+            return df
+        finally:
+            if temp_path is not None:
+                os.remove(temp_path)
+
+    @staticmethod
+    def _read_csv_table(path: str, dtype=None) -> pa.Table:
+        """
+        Parses a CSV file into an Arrow table using the multithreaded Arrow CSV reader.
+
+        Args:
+            path (str): The path of the CSV file.
+            dtype (dict, optional): Column types as Arrow types or aliases such as "int64" or "string".
+
+        Returns:
+            pa.Table: The parsed CSV content.
+        """
+        return pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+            # Quoted cells may span lines, so blocks must not be split at every newline
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(column_types=dtype or {}),
+        )
+
+    @classmethod
+    def _iter_csv_chunks(
+        cls, path: str, chunksize: int, dtype=None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Parses a CSV file like filter_and_merge_csv_files and yields its rows in DataFrames of `chunksize` rows.
+        The whole file is parsed before the first chunk is yielded, so column types are inferred from all
+        of its rows and a value that does not fit a column fails before any of its data is returned.
+
+        Args:
+            path (str): The path of the CSV file.
+            chunksize (int): The maximum number of rows per yielded DataFrame.
+            dtype (dict, optional): Column types as Arrow types or aliases such as "int64" or "string".
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of rows (backed by Arrow dtypes).
+        """
+        table = cls._read_csv_table(path, dtype)
+        for offset in range(0, table.num_rows, chunksize):
+            yield table.slice(offset, chunksize).to_pandas(types_mapper=pd.ArrowDtype)
+
+    def _list_matching_csv_files(
+        self,
+        teams_group_id: str,
+        folder_path: str,
+        file_prefix: str,
+        ignore_case: bool = False,
+    ) -> List[dict]:
+        """
+        Lists the CSV files of a Microsoft Teams folder whose names start with a prefix.
+
+        Args:
+            teams_group_id (str): The identifier for the Microsoft Teams group.
+            folder_path (str): The relative path to the folder within the Teams document library.
+            file_prefix (str): The prefix used to filter specific CSV files.
+            ignore_case (bool, optional): Whether the prefix and extension are matched case-insensitively. Default to False.
+
+        Returns:
+            list: The matching drive items, in folder order.
+
+        Raises:
+            HTTPError: If any API request fails.
+            ValueError: If the folder is empty or inaccessible.
+        """
+        # Build the URL for folder contents, addressing the folder by path so its ID
+        # does not need to be looked up first, and requesting only the fields used below
+        folder_contents_url = f"https://graph.microsoft.com/v1.0/groups/{teams_group_id}/drive/root:/{folder_path}:/children?$select=id,name,file&$top=999"
+
+        # Request folder contents from Microsoft Graph API
+        response = self.session.get(folder_contents_url)
+        response.raise_for_status()
+
+        # Parse the folder contents
+        folder_contents = orjson.loads(response.content)
+        if "value" not in folder_contents:
+            raise ValueError("The folder is empty or inaccessible.")
+
+        # Follow the paging links so large folders are listed completely
+        next_link = folder_contents.get("@odata.nextLink")
+        while next_link:
+            response = self.session.get(next_link)
             response.raise_for_status()
-            excel_content = BytesIO(response.excel_content)
-            if dtype is not None:
-                df = pd.read_excel(
-                    excel_content, dtype=dtype, sheet_name=sheet_name, usecols=usecols
-                )
-            else:
-                df = pd.read_excel(
-                    excel_content, sheet_name=sheet_name, usecols=usecols
-                )
-                return df
-        except requests.exceptions.HTTPError as http_err:
-            return f"HTTP error accured: {http_err}"
-        except Exception as err:
-            return f"Other error occured: {err}"
+            page = orjson.loads(response.content)
+            folder_contents["value"].extend(page.get("value", []))
+            next_link = page.get("@odata.nextLink")
+
+        # Keep only files matching the prefix and CSV extension
+        name_pattern = re.compile(
+            rf"(?={re.escape(file_prefix)}).*\.csv\Z",
+            re.DOTALL | (re.IGNORECASE if ignore_case else 0),
+        )
+        return [
+            item
+            for item in folder_contents["value"]
+            if "file" in item and name_pattern.match(item["name"])
+        ]
 
     def filter_and_merge_csv_files(
-        self, site_id: str, teams_group_id: str, folder_path: str, file_prefix: str
+        self,
+        site_id: str,
+        teams_group_id: str,
+        folder_path: str,
+        file_prefix: str,
+        dtype=None,
+        ignore_case: bool = False,
     ):
         """
         Filters and merges CSV files from a Microsoft Teams folder using Microsoft Graph API.
@@ -155,110 +756,333 @@ class MICROSOFT_GRAPH:
         - teams_group_id (str): The identifier for the Microsoft Teams group.
         - folder_path (str): The relative path to the folder within the Teams document library.
         - file_prefix (str): The prefix used to filter specific CSV files.
+        - dtype (dict, optional): Column types as Arrow types or aliases, skips type inference when known.
+        - ignore_case (bool, optional): Whether the prefix and extension are matched case-insensitively. Default to False.
 
         Returns:
-        - pd.DataFrame: A Pandas DataFrame containing the merged content of the filtered CSV files.
+        - pd.DataFrame: A Pandas DataFrame (backed by Arrow dtypes) containing the merged content of the filtered CSV files.
 
         Raises:
         - HTTPError: If any API request fails.
+        - ConnectionError: If a download keeps losing its connection or timing out.
         - ValueError: If no CSV files matching the criteria are found.
         """
-        # Fetch folder and drive IDs
-        folder_id = self._get_folder_id(teams_group_id, folder_path)
+        # Fetch the drive ID and the matching files
         drive_id = self._get_drive_id(site_id)
+        matches = self._list_matching_csv_files(
+            teams_group_id, folder_path, file_prefix, ignore_case
+        )
 
-        # Build the URL for folder contents
-        folder_contents_url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/items/{folder_id}/children"
-        # Set up headers for authentication
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-
-        # Request folder contents from Microsoft Graph API
-        response = requests.get(folder_contents_url, headers=headers)
-        response.raise_for_status()
-
-        # Parse the folder contents
-        folder_contents = response.json()
-
-        # Initialize a list to store DataFrames
-        df_list = []
         print("File merge is in progress...")
+        for item in matches:
+            print(f"Merging file: {item['name']}")
 
-        # Check if folder contains any items
-        if "value" in folder_contents:
-            for item in folder_contents["value"]:
-                if "file" in item:  # Ensure the item is a file
-                    # Check for files matching the prefix and CSV extension
-                    if item["name"].startswith(file_prefix) and item["name"].endswith(
-                        ".csv"
-                    ):
-                        file_url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/items/{item['id']}/content"
-                        print(f"Merging file: {item['name']}")
-
-                        # Download the CSV file content
-                        file_response = requests.get(file_url, headers=headers)
-                        file_response.raise_for_status()
-
-                        # Load the CSV content into a Pandas DataFrame
-                        csv_content = BytesIO(file_response.content)
-                        df = pd.read_csv(csv_content)
-                        df_list.append(df)
-
-            # Check if any DataFrames were created
-            if df_list:
-                # Combine all DataFrames into one
-                combined_df = pd.concat(df_list, ignore_index=True)
-                print("File merge completed successfully!")
-                return combined_df
-            else:
-                raise ValueError(
-                    "No CSV files matching the specified prefix were found."
+        # Download the CSV files through JSON batching, parsing each one into
+        # an Arrow table as soon as it has been downloaded
+        tables = self._batch_download_files(
+            site_id,
+            drive_id,
+            matches,
+            partial(self._read_csv_table, dtype=dtype),
+        )
+
+        # Check if any tables were created
+        if tables:
+            try:
+                # Combine all tables into one without copying their columns
+                combined_table = pa.concat_tables(tables, promote_options="permissive")
+                combined_df = combined_table.to_pandas(types_mapper=pd.ArrowDtype)
+            except (pa.ArrowTypeError, pa.ArrowInvalid):
+                # Columns with conflicting types across files are left to pandas to upcast
+                combined_df = pd.concat(
+                    [table.to_pandas(types_mapper=pd.ArrowDtype) for table in tables],
+                    ignore_index=True,
+                    copy=False,
+                    sort=False,
                 )
+            print("File merge completed successfully!")
+            return combined_df
         else:
-            raise ValueError("The folder is empty or inaccessible.")
+            raise ValueError("No CSV files matching the specified prefix were found.")
 
+    def iter_merged_csv(
+        self,
+        site_id: str,
+        teams_group_id: str,
+        folder_path: str,
+        file_prefix: str,
+        chunksize: int = 1_000_000,
+        dtype=None,
+        ignore_case: bool = False,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Filters CSV files from a Microsoft Teams folder like filter_and_merge_csv_files, but yields
+        their rows in chunks instead of returning one combined DataFrame. Only one batch of files
+        is kept on disk and one file in memory at a time, so folders larger than memory can be
+        processed chunk by chunk (e.g. written to Parquet or a database).
 
-def upload_file_to_existing_folder(
-    self, teams_group_id: str, folder_path: str, file_name: str
-) -> None:
-    """
-    Uploads a file to an existing folder in a Microsoft Teams group's document library using Microsoft Graph API.
+        Parameters:
+        - site_id (str): The unique identifier for the SharePoint site.
+        - teams_group_id (str): The identifier for the Microsoft Teams group.
+        - folder_path (str): The relative path to the folder within the Teams document library.
+        - file_prefix (str): The prefix used to filter specific CSV files.
+        - chunksize (int, optional): The maximum number of rows per yielded DataFrame. Default to 1,000,000.
+        - dtype (dict, optional): Column types as Arrow types or aliases, as for filter_and_merge_csv_files.
+        - ignore_case (bool, optional): Whether the prefix and extension are matched case-insensitively. Default to False.
+
+        Yields:
+        - pd.DataFrame: Consecutive chunks of rows (backed by Arrow dtypes), file by file.
 
-    Parameters:
-    - teams_group_id (str): The identifier of the Microsoft Teams group.
-    - folder_path (str): The relative path to the folder where the file should be uploaded.
-    - file_name (str): The name of the file to upload (including its extension).
+        Raises:
+        - HTTPError: If any API request fails.
+        - ConnectionError: If a download keeps losing its connection or timing out.
+        - ValueError: If chunksize is not a positive integer (raised on the call), or no CSV files
+          matching the criteria are found (raised on the first iteration).
+        """
+        # Checked here rather than in the generator, so a bad value fails on the call itself
+        if not isinstance(chunksize, int) or chunksize < 1:
+            raise ValueError("chunksize must be an integer >= 1.")
+        return self._iter_merged_csv(
+            site_id,
+            teams_group_id,
+            folder_path,
+            file_prefix,
+            chunksize,
+            dtype,
+            ignore_case,
+        )
 
-    Returns:
-    - None
+    def _iter_merged_csv(
+        self,
+        site_id: str,
+        teams_group_id: str,
+        folder_path: str,
+        file_prefix: str,
+        chunksize: int,
+        dtype,
+        ignore_case: bool,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Generator behind iter_merged_csv, see there for the parameters.
+        """
+        drive_id = self._get_drive_id(site_id)
+        matches = self._list_matching_csv_files(
+            teams_group_id, folder_path, file_prefix, ignore_case
+        )
+        if not matches:
+            raise ValueError("No CSV files matching the specified prefix were found.")
+
+        for start in range(0, len(matches), GRAPH_BATCH_LIMIT):
+            paths = self._batch_download_files(
+                site_id, drive_id, matches[start : start + GRAPH_BATCH_LIMIT]
+            )
+            try:
+                for path in paths:
+                    yield from self._iter_csv_chunks(path, chunksize, dtype)
+            finally:
+                # Remove the temporary files, even if the caller stops iterating early
+                for path in paths:
+                    os.remove(path)
+
+    def upload_file_to_existing_folder(
+        self, teams_group_id: str, folder_path: str, file_name: str
+    ) -> None:
+        """
+        Uploads a file to an existing folder in a Microsoft Teams group's document library using Microsoft Graph API.
+        Files larger than 4 MB are sent in 10 MiB ranges through an upload session.
+
+        Parameters:
+        - teams_group_id (str): The identifier of the Microsoft Teams group.
+        - folder_path (str): The relative path to the folder where the file should be uploaded.
+        - file_name (str): The name of the file to upload (including its extension).
+
+        Returns:
+        - None
+
+        Raises:
+        - HTTPError: If the API request fails.
+        - ConnectionError: If a range keeps losing its connection or timing out.
+        - FileNotFoundError: If the specified file is not found locally.
+        """
+        # Get the folder ID
+        folder_id = self._get_folder_id(teams_group_id, folder_path)
+        item_url = f"https://graph.microsoft.com/v1.0/groups/{teams_group_id}/drive/items/{folder_id}:/{os.path.basename(file_name)}:"
+        file_size = os.path.getsize(file_name)
+
+        if file_size <= SIMPLE_UPLOAD_LIMIT:
+            # Read the file content in binary mode
+            with open(file_name, "rb") as content_file:
+                file_content = content_file.read()
+
+            # Send PUT request to upload the file
+            response = self.session.put(f"{item_url}/content", data=file_content)
+            response.raise_for_status()  # Raise an error for unsuccessful requests
+        else:
+            # Create an upload session and send the file to it range by range
+            response = self.session.post(
+                f"{item_url}/createUploadSession",
+                json={"item": {"@microsoft.graph.conflictBehavior": "replace"}},
+            )
+            response.raise_for_status()
+            upload_url = orjson.loads(response.content)["uploadUrl"]
+            try:
+                self._run_coroutine(
+                    self._upload_chunks(upload_url, file_name, file_size)
+                )
+            except BaseException:
+                # Cancel the upload session instead of leaving it open until it expires.
+                # The session URL is pre-authenticated and must not carry the bearer token.
+                try:
+                    requests.delete(upload_url)
+                except requests.exceptions.RequestException:
+                    pass
+                raise
 
-    Raises:
-    - HTTPError: If the API request fails.
-    - FileNotFoundError: If the specified file is not found locally.
-    - ValueError: If there is an issue with the folder path or upload endpoint.
-    """
-    # Get the folder ID
-    folder_id = self._get_folder_id(
-        teams_group_id, folder_path
-    )  # Ensure correct method call
-    upload_endpoint = f"https://graph.microsoft.com/v1.0/groups/{teams_group_id}/drive/items/{folder_id}:/{file_name}:/content"
-    headers = {"Authorization": f"Bearer {self.access_token}"}
-
-    try:
-        # Read the file content in binary mode
-        with open(file_name, "rb") as content_file:
-            file_content = content_file.read()
-
-        # Send PUT request to upload the file
-        response = requests.put(upload_endpoint, headers=headers, data=file_content)
-        response.raise_for_status()  # Raise an error for unsuccessful requests
         print(f"{file_name} has been uploaded successfully!")
 
-    except FileNotFoundError:
-        print(f"Error: The file '{file_name}' was not found.")
-    except requests.exceptions.HTTPError as http_err:
-        print(f"HTTP error occurred: {http_err}")
-    except Exception as err:
-        print(f"An error occurred: {err}")
+    async def _upload_chunks(
+        self, upload_url: str, file_name: str, file_size: int
+    ) -> None:
+        """
+        Uploads a file to an upload session in consecutive ranges. Graph only accepts the ranges
+        in order, so the next range is read from disk while the current one is being sent.
+
+        Args:
+            upload_url (str): The pre-authenticated URL of the upload session.
+            file_name (str): The path of the local file.
+            file_size (int): The size of the local file in bytes.
+
+        Raises:
+            HTTPError: If any of the ranges cannot be uploaded.
+            ConnectionError: If a range keeps losing its connection or timing out.
+        """
+        async with httpx.AsyncClient(http2=True, timeout=TRANSFER_TIMEOUT) as client:
+            with open(file_name, "rb") as content_file:
+                next_chunk = asyncio.ensure_future(
+                    asyncio.to_thread(content_file.read, UPLOAD_CHUNK_SIZE)
+                )
+                try:
+                    start = 0
+                    while start < file_size:
+                        chunk = await next_chunk
+                        if not chunk:
+                            raise EOFError(f"{file_name} changed during the upload.")
+                        end = start + len(chunk) - 1
+                        if end + 1 < file_size:
+                            next_chunk = asyncio.ensure_future(
+                                asyncio.to_thread(content_file.read, UPLOAD_CHUNK_SIZE)
+                            )
+
+                        start = await self._upload_range(
+                            client, upload_url, chunk, start, file_size
+                        )
+                        if start != end + 1 and start < file_size:
+                            # Graph expects another offset, so continue reading from there
+                            await asyncio.wait({next_chunk})
+                            content_file.seek(start)
+                            next_chunk = asyncio.ensure_future(
+                                asyncio.to_thread(content_file.read, UPLOAD_CHUNK_SIZE)
+                            )
+                finally:
+                    # Let a pending read finish before the file is closed
+                    if not next_chunk.done():
+                        await asyncio.wait({next_chunk})
+
+    async def _upload_range(
+        self,
+        client: httpx.AsyncClient,
+        upload_url: str,
+        chunk: bytes,
+        start: int,
+        file_size: int,
+    ) -> int:
+        """
+        Uploads one range to an upload session, retrying throttled and failed attempts.
+        A failed attempt may still have been stored, so before retrying, the session is asked
+        which byte it expects next and the upload resumes from there.
+
+        Args:
+            client (httpx.AsyncClient): The client used for the upload.
+            upload_url (str): The pre-authenticated URL of the upload session.
+            chunk (bytes): The content of the range.
+            start (int): The offset of the range in the file.
+            file_size (int): The size of the local file in bytes.
+
+        Returns:
+            int: The offset of the next byte Graph expects.
+
+        Raises:
+            HTTPError: If the range cannot be uploaded.
+            ConnectionError: If the range keeps losing its connection or timing out.
+        """
+        end = start + len(chunk) - 1
+        content_range = f"bytes {start}-{end}/{file_size}"
+        for attempt in range(MAX_RETRIES + 1):
+            last_attempt = attempt == MAX_RETRIES
+            try:
+                response = await client.put(
+                    upload_url,
+                    content=chunk,
+                    headers={"Content-Range": content_range},
+                )
+            except httpx.TransportError as error:
+                # Dropped connections and timeouts are retried the same way
+                if last_attempt:
+                    raise requests.exceptions.ConnectionError(str(error)) from error
+                retry_after = None
+            else:
+                if attempt > 0 and end + 1 == file_size and response.status_code == 404:
+                    # An earlier attempt completed the upload, which closes the session
+                    return file_size
+                if attempt > 0 and response.status_code == 416:
+                    # An earlier attempt was stored after all, so continue where Graph expects
+                    next_offset = await self._next_expected_offset(
+                        client, upload_url, file_size
+                    )
+                    if next_offset is not None and next_offset != start:
+                        return next_offset
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    self._raise_for_status(response)
+                    return end + 1
+                # Throttled or failed ranges are retried after a delay
+                retry_after = response.headers.get("Retry-After")
+            await asyncio.sleep(self._retry_delay(attempt, retry_after))
+
+            next_offset = await self._next_expected_offset(
+                client, upload_url, file_size
+            )
+            if next_offset is not None and next_offset != start:
+                return next_offset
+
+    async def _next_expected_offset(
+        self, client: httpx.AsyncClient, upload_url: str, file_size: int
+    ) -> Optional[int]:
+        """
+        Asks an upload session which byte it expects next, using its nextExpectedRanges.
+
+        Args:
+            client (httpx.AsyncClient): The client used for the upload.
+            upload_url (str): The pre-authenticated URL of the upload session.
+            file_size (int): The size of the local file in bytes.
+
+        Returns:
+            int or None: The offset of the next expected byte, the file size if every byte was received,
+            or None if the status of the session cannot be retrieved.
+        """
+        try:
+            response = await client.get(upload_url)
+        except httpx.TransportError:
+            return None
+        if response.is_error:
+            return None
+        try:
+            next_ranges = orjson.loads(response.content).get("nextExpectedRanges", [])
+        except orjson.JSONDecodeError:
+            return None
+        if not next_ranges:
+            return file_size
+        # Ranges look like "12345-" or "12345-67890"
+        return int(next_ranges[0].split("-")[0])
 
 
 # implementation